@@ -0,0 +1,118 @@
+"""initial schema
+
+Databases created before migrations existed already have these tables;
+mark them with `alembic stamp 0001` and then run `alembic upgrade head`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 02:43:33.978114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('api_endpoints',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('method', sa.String(), nullable=False),
+    sa.Column('endpoint', sa.String(), nullable=False),
+    sa.Column('response_type', sa.String(), nullable=False),
+    sa.Column('part_description', sa.Text(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('params', sa.JSON(), nullable=False),
+    sa.Column('sample_request', sa.Text(), nullable=True),
+    sa.Column('sample_response', sa.Text(), nullable=True),
+    sa.Column('enabled', sa.Boolean(), nullable=True),
+    sa.Column('is_visible_in_stats', sa.Boolean(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('endpoint')
+    )
+    with op.batch_alter_table('api_endpoints', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_api_endpoints_name'), ['name'], unique=False)
+        batch_op.create_index('ix_api_endpoints_visible', ['is_visible_in_stats'], unique=False, postgresql_where=sa.text('is_visible_in_stats'), sqlite_where=sa.text('is_visible_in_stats = 1'))
+
+    op.create_table('api_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('daily_requests', sa.Integer(), nullable=True),
+    sa.Column('weekly_requests', sa.Integer(), nullable=True),
+    sa.Column('monthly_requests', sa.Integer(), nullable=True),
+    sa.Column('average_response_time', sa.Float(), nullable=True),
+    sa.Column('success_rate', sa.Float(), nullable=True),
+    sa.Column('popularity', sa.Float(), nullable=True),
+    sa.Column('last_updated', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('api_stats', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_api_stats_name'), ['name'], unique=True)
+
+    op.create_table('request_log',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('api_name', sa.String(), nullable=True),
+    sa.Column('client_ip', sa.String(), nullable=True),
+    sa.Column('response_time', sa.Float(), nullable=True),
+    sa.Column('status_code', sa.Integer(), nullable=True),
+    sa.Column('timestamp', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('request_logs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('endpoint', sa.String(), nullable=True),
+    sa.Column('method', sa.String(), nullable=True),
+    sa.Column('status_code', sa.Integer(), nullable=True),
+    sa.Column('response_time', sa.Float(), nullable=True),
+    sa.Column('timestamp', sa.DateTime(), nullable=True),
+    sa.Column('request_body', sa.Text(), nullable=True),
+    sa.Column('response_body', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('request_logs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_request_logs_id'), ['id'], unique=False)
+
+    op.create_table('statistics',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('total_requests', sa.Integer(), nullable=True),
+    sa.Column('unique_users', sa.Integer(), nullable=True),
+    sa.Column('timestamp', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('password', sa.String(), nullable=False),
+    sa.Column('is_admin', sa.Boolean(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('username')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('users')
+    op.drop_table('statistics')
+    with op.batch_alter_table('request_logs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_request_logs_id'))
+
+    op.drop_table('request_logs')
+    op.drop_table('request_log')
+    with op.batch_alter_table('api_stats', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_api_stats_name'))
+
+    op.drop_table('api_stats')
+    with op.batch_alter_table('api_endpoints', schema=None) as batch_op:
+        batch_op.drop_index('ix_api_endpoints_visible', postgresql_where=sa.text('is_visible_in_stats'), sqlite_where=sa.text('is_visible_in_stats = 1'))
+        batch_op.drop_index(batch_op.f('ix_api_endpoints_name'))
+
+    op.drop_table('api_endpoints')
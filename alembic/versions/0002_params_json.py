@@ -0,0 +1,66 @@
+"""store api_endpoints.params as native JSON
+
+Rewrites unreadable or non-list params as [] and converts the column type
+on backends with a JSON type. SQLite keeps TEXT storage, which
+sqlalchemy.JSON reads as-is.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 03:10:00.000000
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _normalize(raw):
+    try:
+        params = json.loads(raw) if raw else []
+    except (TypeError, json.JSONDecodeError):
+        params = []
+    if not isinstance(params, list):
+        params = []
+    return json.dumps(params)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+
+    if dialect == 'postgresql':
+        rows = bind.execute(sa.text("SELECT id, params::text FROM api_endpoints")).all()
+    else:
+        rows = bind.execute(sa.text("SELECT id, params FROM api_endpoints")).all()
+
+    updates = []
+    for endpoint_id, raw in rows:
+        normalized = _normalize(raw)
+        if normalized != raw:
+            updates.append({"id": endpoint_id, "params": normalized})
+    if updates:
+        bind.execute(sa.text("UPDATE api_endpoints SET params = :params WHERE id = :id"), updates)
+
+    if dialect == 'postgresql':
+        op.execute("ALTER TABLE api_endpoints ALTER COLUMN params TYPE JSON USING params::json")
+    elif dialect == 'mysql':
+        op.execute("ALTER TABLE api_endpoints MODIFY params JSON NOT NULL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("ALTER TABLE api_endpoints ALTER COLUMN params TYPE TEXT USING params::text")
+    elif dialect == 'mysql':
+        op.execute("ALTER TABLE api_endpoints MODIFY params TEXT NOT NULL")
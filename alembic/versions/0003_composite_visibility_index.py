@@ -0,0 +1,47 @@
+"""composite visibility index
+
+Replaces the partial is_visible_in_stats index with one on
+(is_visible_in_stats, endpoint), which also covers the /statistics join key.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 03:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases stamped at 0001 from a pre-migration schema never had the partial index
+    op.drop_index('ix_api_endpoints_visible', table_name='api_endpoints', if_exists=True)
+    op.create_index(
+        'ix_api_endpoints_visible_endpoint',
+        'api_endpoints',
+        ['is_visible_in_stats', 'endpoint'],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_api_endpoints_visible_endpoint', table_name='api_endpoints')
+    op.create_index(
+        'ix_api_endpoints_visible',
+        'api_endpoints',
+        ['is_visible_in_stats'],
+        unique=False,
+        postgresql_where=sa.text('is_visible_in_stats'),
+        sqlite_where=sa.text('is_visible_in_stats = 1'),
+    )
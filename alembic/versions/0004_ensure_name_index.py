@@ -0,0 +1,33 @@
+"""ensure api_endpoints.name is indexed
+
+0001 creates ix_api_endpoints_name, but databases stamped at 0001 from the
+pre-migration schema never ran it. endpoint and api_stats.name are already
+backed by their UNIQUE constraints' indexes there.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 04:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_api_endpoints_name', 'api_endpoints', ['name'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The index belongs to 0001; nothing to undo here
+    pass
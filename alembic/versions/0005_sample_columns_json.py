@@ -0,0 +1,66 @@
+"""store sample_request/sample_response as native JSON
+
+Rewrites empty or unreadable samples as NULL and converts both columns to
+JSON; on Postgres all three JSON columns become JSONB.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16 05:00:00.000000
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SAMPLE_COLUMNS = ('sample_request', 'sample_response')
+
+
+def _is_json(raw):
+    if not raw:
+        return False
+    try:
+        json.loads(raw)
+    except (TypeError, json.JSONDecodeError):
+        return False
+    return True
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+
+    for column in SAMPLE_COLUMNS:
+        rows = bind.execute(sa.text(f"SELECT id, {column} FROM api_endpoints WHERE {column} IS NOT NULL")).all()
+        invalid = [{"id": endpoint_id} for endpoint_id, raw in rows if not _is_json(raw)]
+        if invalid:
+            bind.execute(sa.text(f"UPDATE api_endpoints SET {column} = NULL WHERE id = :id"), invalid)
+
+    if dialect == 'postgresql':
+        for column in SAMPLE_COLUMNS + ('params',):
+            op.execute(f"ALTER TABLE api_endpoints ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb")
+    else:
+        with op.batch_alter_table('api_endpoints') as batch_op:
+            for column in SAMPLE_COLUMNS:
+                batch_op.alter_column(column, existing_type=sa.Text(), type_=sa.JSON(), existing_nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("ALTER TABLE api_endpoints ALTER COLUMN params TYPE JSON USING params::json")
+        for column in SAMPLE_COLUMNS:
+            op.execute(f"ALTER TABLE api_endpoints ALTER COLUMN {column} TYPE TEXT USING {column}::text")
+    else:
+        with op.batch_alter_table('api_endpoints') as batch_op:
+            for column in SAMPLE_COLUMNS:
+                batch_op.alter_column(column, existing_type=sa.JSON(), type_=sa.Text(), existing_nullable=True)
@@ -1,21 +1,39 @@
 from fastapi import APIRouter, Request, HTTPException
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator
 from typing import Tuple
 import qrcode
 from qrcode.image.styledpil import StyledPilImage
 from qrcode.image.styles.moduledrawers import (
-    SquareModuleDrawer, CircleModuleDrawer, RoundedModuleDrawer,
+    CircleModuleDrawer, RoundedModuleDrawer,
     GappedSquareModuleDrawer, VerticalBarsDrawer, HorizontalBarsDrawer
 )
 import io
 import re
+import copy
 import logging
-import svgwrite
+import threading
+from functools import lru_cache
+from cachetools import LRUCache, cached
+import numpy as np
+from PIL import Image
+
+try:
+    import pyvips
+except (ImportError, OSError):  # OSError: binding present but libvips missing
+    pyvips = None
 
 logger = logging.getLogger(__name__)
 qr_api = APIRouter()
 
+# Rendered output is bounded by total bytes rather than entry count, since a
+# 2000px JPEG is orders of magnitude larger than a small SVG.
+QR_OUTPUT_CACHE_BYTES = 32 * 1024 * 1024
+
+if pyvips is not None:
+    # Every image is encoded once; libvips' operation cache would only pin them.
+    pyvips.cache_set_max(0)
+
 VALID_FORMATS = {'png', 'jpg', 'svg'}
 VALID_STYLES = {
     'square': 'square',
@@ -35,19 +53,22 @@ class QRRequest(BaseModel):
     resolution: int = Field(default=600, ge=100, le=2000)
     border: int = Field(default=4, ge=0, le=20)
 
-    @validator('format')
+    @field_validator('format')
+    @classmethod
     def validate_format(cls, v):
         if v.lower() not in VALID_FORMATS:
             raise ValueError(f"Unsupported format: {v}. Use {', '.join(VALID_FORMATS)}.")
         return v.lower()
 
-    @validator('style')
+    @field_validator('style')
+    @classmethod
     def validate_style(cls, v):
         if v.lower() not in VALID_STYLES:
             raise ValueError(f"Unsupported style: {v}. Use {', '.join(VALID_STYLES.keys())}.")
         return v.lower()
 
-    @validator('fill_color', 'back_color')
+    @field_validator('fill_color', 'back_color')
+    @classmethod
     def validate_color(cls, v):
         if not re.match(r'^#(?:[0-9a-fA-F]{3}){1,2}$', v):
             raise ValueError(f"Invalid color: {v}. Use hex code (e.g., '#FF0000').")
@@ -59,106 +80,197 @@ def calculate_box_size(qr: qrcode.QRCode, resolution: int) -> int:
     box_size = max(1, resolution // module_count)
     return box_size
 
+def _svg_number(value: float) -> str:
+    """Format an SVG coordinate with at most two decimals (sub-pixel precision is invisible)."""
+    return f"{round(value, 2):g}"
+
+# SVG subpath emitters. Each factory takes box_size once per render and returns a
+# function producing one subpath, so per-style constants and the style dispatch
+# stay out of the per-module loop. Run emitters draw a horizontal run of modules.
+def _square_run_emitter(box_size: int):
+    return lambda pos_x, pos_y, width: f'M{pos_x} {pos_y}h{width}v{box_size}h-{width}z'
+
+def _horizontal_bars_run_emitter(box_size: int):
+    offset = box_size * 0.25
+    height = _svg_number(box_size * 0.5)
+    return lambda pos_x, pos_y, width: f'M{pos_x} {_svg_number(pos_y + offset)}h{width}v{height}h-{width}z'
+
+def _circle_emitter(box_size: int):
+    # Slightly smaller circles for better spacing
+    r = box_size / 2.2
+    offset_x = box_size / 2 - r
+    offset_y = box_size / 2
+    radius, diameter = _svg_number(r), _svg_number(2 * r)
+    arcs = f'a{radius} {radius} 0 1 0 {diameter} 0a{radius} {radius} 0 1 0 -{diameter} 0z'
+    return lambda pos_x, pos_y: f'M{_svg_number(pos_x + offset_x)} {_svg_number(pos_y + offset_y)}{arcs}'
+
+def _rounded_emitter(box_size: int):
+    offset_x, offset_y = box_size * 0.3, box_size * 0.1
+    r = _svg_number(box_size * 0.2)
+    side = _svg_number(box_size * 0.4)
+    outline = (f'h{side}a{r} {r} 0 0 1 {r} {r}v{side}a{r} {r} 0 0 1 -{r} {r}'
+               f'h-{side}a{r} {r} 0 0 1 -{r} -{r}v-{side}a{r} {r} 0 0 1 {r} -{r}z')
+    return lambda pos_x, pos_y: f'M{_svg_number(pos_x + offset_x)} {_svg_number(pos_y + offset_y)}{outline}'
+
+def _gapped_square_emitter(box_size: int):
+    inset = box_size * 0.25
+    side = _svg_number(box_size - 2 * inset)
+    outline = f'h{side}v{side}h-{side}z'
+    return lambda pos_x, pos_y: f'M{_svg_number(pos_x + inset)} {_svg_number(pos_y + inset)}{outline}'
+
+def _vertical_bars_emitter(box_size: int):
+    offset = box_size * 0.25
+    bar = _svg_number(box_size * 0.5)
+    outline = f'h{bar}v{box_size}h-{bar}z'
+    return lambda pos_x, pos_y: f'M{_svg_number(pos_x + offset)} {pos_y}{outline}'
+
+SVG_RUN_EMITTERS = {
+    'square': _square_run_emitter,
+    'horizontal_bars': _horizontal_bars_run_emitter,
+}
+SVG_MODULE_EMITTERS = {
+    'circle': _circle_emitter,
+    'rounded': _rounded_emitter,
+    'gapped_square': _gapped_square_emitter,
+    'vertical_bars': _vertical_bars_emitter,
+}
+
 def generate_svg_qr(qr: qrcode.QRCode, style: str, fill_color: str, back_color: str, resolution: int) -> str:
-    """Generate SVG QR code with specified style."""
+    """Generate SVG QR code with specified style.
+
+    All dark modules are emitted as subpaths of a single <path>; for square and
+    horizontal_bars, horizontal runs of modules are merged into one subpath.
+    """
     box_size = calculate_box_size(qr, resolution)
     total_size = (qr.modules_count + 2 * qr.border) * box_size
-    dwg = svgwrite.Drawing(size=(total_size, total_size))
-
-    # Background
-    dwg.add(dwg.rect(insert=(0, 0), size=(total_size, total_size), fill=back_color))
+    count, border = qr.modules_count, qr.border
 
     # QR modules
-    for y in range(qr.modules_count):
-        for x in range(qr.modules_count):
-            if qr.modules[y][x]:
-                pos_x = (x + qr.border) * box_size
-                pos_y = (y + qr.border) * box_size
-                if style == 'circle':
-                    dwg.add(dwg.circle(
-                        center=(pos_x + box_size / 2, pos_y + box_size / 2),
-                        r=box_size / 2.2,  # Slightly smaller circles for better spacing
-                        fill=fill_color
-                    ))
-                elif style == 'rounded':
-                    dwg.add(dwg.rect(
-                        insert=(pos_x + box_size * 0.1, pos_y + box_size * 0.1),
-                        size=(box_size * 0.8, box_size * 0.8),
-                        rx=box_size * 0.2,
-                        ry=box_size * 0.2,
-                        fill=fill_color
-                    ))
-                elif style == 'gapped_square':
-                    inset = box_size * 0.25
-                    dwg.add(dwg.rect(
-                        insert=(pos_x + inset, pos_y + inset),
-                        size=(box_size - 2 * inset, box_size - 2 * inset),
-                        fill=fill_color
-                    ))
-                elif style == 'vertical_bars':
-                    dwg.add(dwg.rect(
-                        insert=(pos_x + box_size * 0.25, pos_y),
-                        size=(box_size * 0.5, box_size),
-                        fill=fill_color
-                    ))
-                elif style == 'horizontal_bars':
-                    dwg.add(dwg.rect(
-                        insert=(pos_x, pos_y + box_size * 0.25),
-                        size=(box_size, box_size * 0.5),
-                        fill=fill_color
-                    ))
-                else:  # square
-                    dwg.add(dwg.rect(
-                        insert=(pos_x, pos_y),
-                        size=(box_size, box_size),
-                        fill=fill_color
-                    ))
-
-    return dwg.tostring()
+    modules = np.asarray(qr.modules, dtype=bool)
+    if style in SVG_RUN_EMITTERS:
+        emit_run = SVG_RUN_EMITTERS[style](box_size)
+        # Rising/falling edges of each zero-padded row mark where runs of dark modules start/end
+        padded = np.zeros((count, count + 2), dtype=np.int8)
+        padded[:, 1:-1] = modules
+        edges = np.diff(padded, axis=1)
+        ys, starts = np.nonzero(edges == 1)
+        ends = np.nonzero(edges == -1)[1]
+        pos_xs = ((starts + border) * box_size).tolist()
+        pos_ys = ((ys + border) * box_size).tolist()
+        widths = ((ends - starts) * box_size).tolist()
+        d = [emit_run(pos_x, pos_y, width) for pos_x, pos_y, width in zip(pos_xs, pos_ys, widths)]
+    else:
+        emit = SVG_MODULE_EMITTERS[style](box_size)
+        ys, xs = np.nonzero(modules)
+        pos_xs = ((xs + border) * box_size).tolist()
+        pos_ys = ((ys + border) * box_size).tolist()
+        d = [emit(pos_x, pos_y) for pos_x, pos_y in zip(pos_xs, pos_ys)]
 
-def generate_qr_image(data: str, output_format: str, style: str, fill_color: str, back_color: str, 
-                     resolution: int, border: int) -> Tuple[io.BytesIO, str]:
-    """Generate QR code with specified resolution."""
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" version="1.1" width="{total_size}" height="{total_size}">'
+        f'<rect x="0" y="0" width="{total_size}" height="{total_size}" fill="{back_color}" />'
+        f'<path d="{"".join(d)}" fill="{fill_color}" />'
+        '</svg>'
+    )
+
+@lru_cache(maxsize=512)
+def encode_qr(data: str) -> qrcode.QRCode:
+    """Encode data into a QR matrix. The matrix depends only on the data, so it is cached
+    across formats, styles and sizes; callers copy the result before setting border/box_size."""
     qr = qrcode.QRCode(
         version=None,
         error_correction=qrcode.constants.ERROR_CORRECT_H,
         box_size=1,
-        border=border
+        border=0
     )
     qr.add_data(data)
     qr.make(fit=True)
-    
+    return qr
+
+@cached(LRUCache(maxsize=QR_OUTPUT_CACHE_BYTES, getsizeof=lambda value: len(value[0])), lock=threading.Lock())
+def render_qr(data: str, output_format: str, style: str, fill_color: str, back_color: str,
+              resolution: int, border: int) -> Tuple[bytes, str]:
+    """Render QR code bytes and MIME type; identical parameter sets are served from memory."""
+    qr = copy.copy(encode_qr(data))
+    qr.border = border
+
     box_size = calculate_box_size(qr, resolution)
     qr.box_size = box_size
 
     if output_format == 'svg':
         svg_code = generate_svg_qr(qr, style, fill_color, back_color, resolution)
         mime_type = 'image/svg+xml'
-        return io.BytesIO(svg_code.encode()), mime_type
+        return svg_code.encode(), mime_type
     else:
-        module_drawer = {
-            'square': SquareModuleDrawer(),
-            'circle': CircleModuleDrawer(),
-            'rounded': RoundedModuleDrawer(),
-            'gapped_square': GappedSquareModuleDrawer(),
-            'vertical_bars': VerticalBarsDrawer(),
-            'horizontal_bars': HorizontalBarsDrawer()
-        }[style]
-        qr_img = qr.make_image(
-            image_factory=StyledPilImage,
-            module_drawer=module_drawer,
-            fill_color=fill_color,
-            back_color=back_color
-        )
+        if style == 'square':
+            image = render_square_raster(qr)
+        else:
+            module_drawer = {
+                'circle': CircleModuleDrawer(),
+                'rounded': RoundedModuleDrawer(),
+                'gapped_square': GappedSquareModuleDrawer(),
+                'vertical_bars': VerticalBarsDrawer(),
+                'horizontal_bars': HorizontalBarsDrawer()
+            }[style]
+            image = qr.make_image(
+                image_factory=StyledPilImage,
+                module_drawer=module_drawer,
+                fill_color=fill_color,
+                back_color=back_color
+            ).get_image()
+
+        if output_format == 'png':
+            bilevel = as_bilevel(image)
+            if bilevel is not None:
+                return encode_png(bilevel, bitdepth=1), 'image/png'
+            return encode_png(image), 'image/png'
 
+        if image.mode == 'L':
+            image = image.convert('RGB')
         output = io.BytesIO()
-        save_format = output_format.upper()
-        if save_format == 'JPG':
-            save_format = 'JPEG'
-        qr_img.save(output, format=save_format)
-        mime_type = 'image/png' if output_format == 'png' else 'image/jpeg'
-        output.seek(0)
-        return output, mime_type
+        image.save(output, format='JPEG')
+        return output.getvalue(), 'image/jpeg'
+
+# StyledPilImage paints with its default SolidFillColorMask, so raster output is
+# black on white regardless of the requested colours; the NumPy path keeps that.
+def render_square_raster(qr: qrcode.QRCode) -> Image.Image:
+    """Raster square modules by upscaling the module matrix, skipping per-module drawing."""
+    modules = np.where(qr.get_matrix(), 0, 255).astype(np.uint8)
+    pixels = modules.repeat(qr.box_size, axis=0).repeat(qr.box_size, axis=1)
+    return Image.fromarray(pixels, 'L')
+
+BILEVEL_COLORS = {0, 255, (0, 0, 0), (255, 255, 255)}
+
+def as_bilevel(image: Image.Image):
+    """Return the image as 0/255 greyscale if it is pure black and white, else None.
+
+    Anti-aliased styles (circle, rounded, bars) have intermediate shades and
+    are left alone; getcolors() bails out as soon as it sees a third colour.
+    """
+    colors = image.getcolors(2)
+    if colors is None or any(color not in BILEVEL_COLORS for _, color in colors):
+        return None
+    return image if image.mode == 'L' else image.convert('L')
+
+def encode_png(image: Image.Image, bitdepth: int = 8) -> bytes:
+    """Encode a PIL image as PNG, with libvips when available (its deflate is several times faster)."""
+    if pyvips is not None:
+        pixels = np.asarray(image)
+        bands = pixels.shape[2] if pixels.ndim == 3 else 1
+        vips_image = pyvips.Image.new_from_memory(pixels.tobytes(), image.width, image.height, bands, 'uchar')
+        return vips_image.write_to_buffer('.png', bitdepth=bitdepth)
+
+    if bitdepth == 1:
+        image = image.convert('1', dither=Image.Dither.NONE)
+    output = io.BytesIO()
+    image.save(output, format='PNG')
+    return output.getvalue()
+
+def generate_qr_image(data: str, output_format: str, style: str, fill_color: str, back_color: str, 
+                     resolution: int, border: int) -> Tuple[io.BytesIO, str]:
+    """Generate QR code with specified resolution."""
+    content, mime_type = render_qr(data, output_format, style, fill_color, back_color, resolution, border)
+    return io.BytesIO(content), mime_type
 
 @qr_api.post("/v1/qr/generate")
 async def generate_qr(request: QRRequest):
@@ -110,7 +110,7 @@ def configure_error_handlers(app: FastAPI, discord_callback=None):
                 if discord_callback:
                     discord_callback(error_info)
                 else:
-                    logger.debug(f"Discord integration disabled, {status_code} error not sent to Discord")
+                    logger.debug("Discord integration disabled, %s error not sent to Discord", status_code)
             finally:
                 sys.stderr = sys.__stderr__
         response = JSONResponse(
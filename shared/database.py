@@ -1,17 +1,61 @@
-from sqlalchemy import create_engine, Column, String, Boolean, Integer, Float, DateTime, Text
+from sqlalchemy import create_engine, event, Column, String, Boolean, Integer, Float, DateTime, Text, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.dialects.postgresql import JSONB
 from dotenv import load_dotenv
 import os
 import sqlite3
+import time
+import logging
+import orjson
+from datetime import datetime, timezone
+from shared.schema import new_ulid
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Database configuration
 DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///api.db')
-engine = create_engine(DATABASE_URL, echo=False)
+engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    pool_size=10,
+    max_overflow=20,
+    pool_pre_ping=True,
+    json_serializer=lambda value: orjson.dumps(value).decode(),
+    json_deserializer=orjson.loads,
+)
+
+if engine.dialect.name == 'sqlite':
+    # WAL lets the request-log writes proceed without blocking endpoint/stat reads
+    @event.listens_for(engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute('PRAGMA mmap_size=134217728')
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.close()
+
+# Log statements slower than SLOW_QUERY_MS so missing indexes show up in the logs
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '100'))
+
+@event.listens_for(engine, 'before_cursor_execute')
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+@event.listens_for(engine, 'after_cursor_execute')
+def _log_slow_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info['query_start_time'].pop()) * 1000
+    if elapsed_ms > SLOW_QUERY_MS:
+        logger.warning("Slow query (%.1f ms): %s", elapsed_ms, statement)
+
 Base = declarative_base()
 
+# Parsed by the driver/engine on read; JSONB on Postgres, JSON (or TEXT on SQLite) elsewhere
+JSONType = JSON().with_variant(JSONB(), 'postgresql')
+
 # Database Models
 class User(Base):
     __tablename__ = 'users'
@@ -22,23 +66,28 @@ class User(Base):
 
 class ApiEndpoint(Base):
     __tablename__ = 'api_endpoints'
-    id = Column(String, primary_key=True)
-    name = Column(String, nullable=False)
+    id = Column(String, primary_key=True, default=new_ulid)
+    name = Column(String, nullable=False, index=True)
     method = Column(String, nullable=False)
     endpoint = Column(String, nullable=False, unique=True)
     response_type = Column(String, nullable=False)
     part_description = Column(Text, nullable=False)
     description = Column(Text, nullable=False)
-    params = Column(Text, nullable=False)
-    sample_request = Column(Text, nullable=True)
-    sample_response = Column(Text, nullable=True)  # JSON string of sample response
+    params = Column(JSONType, nullable=False)
+    sample_request = Column(JSONType, nullable=True)
+    sample_response = Column(JSONType, nullable=True)
     enabled = Column(Boolean, default=True)
     is_visible_in_stats = Column(Boolean, default=True)
 
+    __table_args__ = (
+        # Covers the /statistics join: filter on visibility, join on endpoint
+        Index('ix_api_endpoints_visible_endpoint', 'is_visible_in_stats', 'endpoint'),
+    )
+
 class ApiStat(Base):
     __tablename__ = 'api_stats'
     id = Column(Integer, primary_key=True)
-    name = Column(String, nullable=False, unique=True)
+    name = Column(String, nullable=False, unique=True, index=True)
     daily_requests = Column(Integer, default=0)
     weekly_requests = Column(Integer, default=0)
     monthly_requests = Column(Integer, default=0)
@@ -63,11 +112,29 @@ class RequestLog(Base):
     status_code = Column(Integer)
     timestamp = Column(DateTime)
 
-# Create tables
-Base.metadata.create_all(engine)
+class AccessLog(Base):
+    __tablename__ = 'request_logs'
+    id = Column(Integer, primary_key=True, index=True)
+    endpoint = Column(String)
+    method = Column(String)
+    status_code = Column(Integer)
+    response_time = Column(Float)
+    timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    request_body = Column(Text, nullable=True)
+    response_body = Column(Text, nullable=True)
+
+# Create tables. Deployments manage the schema with `alembic upgrade head` and
+# set RUN_CREATE_ALL=0 so workers skip the CREATE TABLE probes on startup.
+if os.getenv('RUN_CREATE_ALL', '1') == '1':
+    Base.metadata.create_all(engine)
 
 # Session factory
-Session = sessionmaker(bind=engine)
+Session = sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)
+
+def get_session():
+    """FastAPI dependency: one Session per request, closed after the response is sent."""
+    with Session() as session:
+        yield session
 
 # SQLite connection for app.py compatibility
 def get_db():
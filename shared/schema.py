@@ -1,6 +1,14 @@
 from pydantic import BaseModel, Field, EmailStr
 from typing import List, Optional, Any
-import uuid
+import os
+import time
+
+_CROCKFORD32 = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+
+def new_ulid() -> str:
+    """26-char ULID: 48-bit ms timestamp + 80 random bits, so new ids sort by creation time."""
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    return ''.join(_CROCKFORD32[(value >> shift) & 31] for shift in range(125, -1, -5))
 
 class ApiParam(BaseModel):
     name: str
@@ -8,7 +16,7 @@ class ApiParam(BaseModel):
     description: str
 
 class ApiEndpointSchema(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_ulid)
     name: str
     method: str
     endpoint: str
@@ -93,7 +93,7 @@ def send_embed_to_channel(channel_id, embed, token):
         )
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to send message to channel {channel_id}: {e}")
+        logger.error("Failed to send message to channel %s: %s", channel_id, e)
 
 def send_error_to_discord(error_info):
     """Send an error message to Discord"""